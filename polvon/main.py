@@ -2,7 +2,6 @@ import argparse
 import sys
 import os
 
-from .tui import PolvonApp
 from . import __version__
 
 
@@ -33,6 +32,7 @@ Keyboard shortcuts:
   d          - Disable selected service
   v          - View status of selected service
   l          - View logs of selected service
+  t          - Cycle log time window (1 hour, 1 day, 1 week, all)
   ↑/↓        - Navigate through services
         """
     )
@@ -59,6 +59,9 @@ Keyboard shortcuts:
         print("Note: Running without sudo. You may need --sudo flag for service management.")
         print("      Some operations may fail without proper permissions.\n")
     
+    # Textual is slow to import, so only load it once the TUI is really starting
+    from .tui import PolvonApp
+    
     try:
         app = PolvonApp(use_sudo=args.sudo)
         app.run()
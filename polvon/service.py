@@ -1,8 +1,17 @@
+import os
 import subprocess
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+import sys
+import threading
+from collections import deque
+from typing import Any, List, Dict, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 
+try:
+    from pystemd.systemd1 import Manager as SystemdManager
+except ImportError:  # pystemd is an optional dependency
+    SystemdManager = None
+
 
 class ServiceState(Enum):
     ACTIVE = "active"
@@ -21,7 +30,54 @@ class ServiceLoadState(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+# systemd always reports states in lowercase, so values map directly to enums
+_LOAD_STATE_MAP = {state.value: state for state in ServiceLoadState}
+_ACTIVE_STATE_MAP = {state.value: state for state in ServiceState}
+
+# Unit properties requested from `systemctl show` when listing services
+_SERVICE_PROPERTIES = ["Id", "LoadState", "ActiveState", "SubState", "Description", "UnitFileState"]
+
+# Unit properties shown in the service status view
+_STATUS_PROPERTIES = [
+    "Description",
+    "LoadState",
+    "FragmentPath",
+    "UnitFileState",
+    "ActiveState",
+    "SubState",
+    "ActiveEnterTimestamp",
+    "MainPID",
+]
+
+# Default time window for journal queries
+DEFAULT_LOG_SINCE = "1 hour ago"
+
+# Messages returned by successful actions, keyed by systemctl command
+SUCCESS_MESSAGES = {
+    "start": "Service {} started successfully",
+    "stop": "Service {} stopped successfully",
+    "restart": "Service {} restarted successfully",
+    "enable": "Service {} enabled successfully",
+    "disable": "Service {} disabled successfully",
+    "daemon-reload": "Daemon reloaded successfully",
+}
+
+# Unit file states that count as "starts on boot"
+_ENABLED_UNIT_FILE_STATES = {"enabled", "enabled-runtime", "alias"}
+
+
+def _to_str(value) -> str:
+    """Decode a DBus string value, which pystemd returns as bytes."""
+    if isinstance(value, bytes):
+        return value.decode(errors="replace")
+    return str(value)
+
+
+# Dataclasses only accept slots=True from Python 3.10 on
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class Service:
     name: str
     load_state: ServiceLoadState
@@ -29,24 +85,81 @@ class Service:
     sub_state: str
     description: str
     enabled: bool = False
+    search_key: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Case-folded once here so search filtering does not redo it per keystroke
+        search_key = f"{self.name}\0{self.description or ''}".casefold()
+        object.__setattr__(self, "search_key", search_key)
 
 
 class ServiceManager:
 
-    def __init__(self, use_sudo: bool = False):
+    def __init__(self, use_sudo: bool = False, use_dbus: bool = True):
         """Initialize the service manager.
         
         Args:
             use_sudo: Whether to use sudo for systemctl commands
+            use_dbus: Whether to talk to systemd over DBus when pystemd is
+                installed, falling back to systemctl otherwise
         """
         self.use_sudo = use_sudo
+        self.use_dbus = use_dbus and SystemdManager is not None
+        self._dbus_manager = None
+        # sd-bus connections must not be shared between threads concurrently
+        self._dbus_lock = threading.Lock()
+
+    def _get_dbus_manager(self):
+        """Return a connected systemd DBus manager, or None if unavailable."""
+        if not self.use_dbus:
+            return None
+        
+        if self._dbus_manager is None:
+            try:
+                manager = SystemdManager()
+                manager.load()
+            except Exception:
+                # No system bus or no systemd; stay on the systemctl path
+                self.use_dbus = False
+                return None
+            self._dbus_manager = manager
+        
+        return self._dbus_manager
+
+    def _call_dbus(self, method: str, *args) -> Tuple[bool, Any]:
+        """Call an org.freedesktop.systemd1.Manager method over DBus.
+        
+        Args:
+            method: Name of the Manager method
+            *args: Arguments to pass to the method
+            
+        Returns:
+            Tuple of (success, result). success is False if DBus is
+            unavailable or the call failed, e.g. because polkit denied it.
+        """
+        with self._dbus_lock:
+            manager = self._get_dbus_manager()
+            if manager is None:
+                return False, None
+            
+            try:
+                return True, getattr(manager.Manager, method)(*args)
+            except Exception:
+                return False, None
 
-    def _run_command(self, args: List[str], capture_output: bool = True) -> Tuple[int, str, str]:
+    def _run_command(
+        self,
+        args: List[str],
+        capture_output: bool = True,
+        capture_stderr_only: bool = False
+    ) -> Tuple[int, str, str]:
         """Safely run a systemctl command.
         
         Args:
             args: Command arguments to pass to systemctl
             capture_output: Whether to capture stdout/stderr
+            capture_stderr_only: Discard stdout and only read stderr, which
+                is decoded only if the command failed
             
         Returns:
             Tuple of (return_code, stdout, stderr)
@@ -57,6 +170,18 @@ class ServiceManager:
         cmd.extend(["systemctl"] + args)
         
         try:
+            if capture_stderr_only:
+                result = subprocess.run(
+                    cmd,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    timeout=30
+                )
+                stderr = ""
+                if result.returncode != 0:
+                    stderr = result.stderr.decode(errors="replace")
+                return result.returncode, "", stderr
+            
             result = subprocess.run(
                 cmd,
                 capture_output=capture_output,
@@ -78,83 +203,207 @@ class ServiceManager:
         Returns:
             List of Service objects
         """
-        args = ["list-units", "--type=service", "--no-pager", "--plain", "--no-legend"]
-        if show_all:
-            args.append("--all")
+        records = self._list_units_dbus()
+        if records is None:
+            records = self._list_units_systemctl()
+        
+        services = []
+        for props in records:
+            if not props.get("Id"):
+                continue
+            
+            service = self._service_from_props(props)
+            # Mirror list-units, which hides inactive units unless --all is given
+            if not show_all and service.active_state == ServiceState.INACTIVE:
+                continue
+            
+            services.append(service)
         
-        returncode, stdout, stderr = self._run_command(args)
+        services.sort(key=lambda service: service.name)
+        return services
+
+    def get_service(self, service_name: str) -> Optional[Service]:
+        """Read the current state of a single service.
+        
+        Args:
+            service_name: Name of the service
+            
+        Returns:
+            Service object or None if failed
+        """
+        records = self._show([service_name], _SERVICE_PROPERTIES)
+        if not records:
+            return None
+        
+        return self._service_from_props(records[0])
+
+    def _service_from_props(self, props: Dict[str, str]) -> Service:
+        """Build a Service from `systemctl show` style properties."""
+        return Service(
+            name=props["Id"],
+            load_state=self._parse_load_state(props.get("LoadState", "")),
+            active_state=self._parse_active_state(props.get("ActiveState", "")),
+            sub_state=props.get("SubState", ""),
+            description=props.get("Description", ""),
+            enabled=props.get("UnitFileState", "") in _ENABLED_UNIT_FILE_STATES
+        )
+
+    def _show(self, unit_names: List[str], properties: List[str]) -> Optional[List[Dict[str, str]]]:
+        """Read properties of several units with one `systemctl show` call.
+        
+        Args:
+            unit_names: Unit names or glob patterns
+            properties: Names of the properties to read
+            
+        Returns:
+            One property dictionary per unit, or None if the command failed.
+            For explicit unit names, records are in argument order.
+        """
+        # Id is never empty, so every unit produces a record even when all
+        # other requested properties are unset
+        if "Id" not in properties:
+            properties = ["Id"] + properties
+        
+        returncode, stdout, stderr = self._run_command(
+            ["show", "--property=" + ",".join(properties), "--"] + unit_names
+        )
         
         if returncode != 0:
-            return []
+            return None
         
-        services = []
-        for line in stdout.strip().split('\n'):
-            if not line.strip():
+        return self._parse_show_output(stdout)
+
+    def _list_units_systemctl(self) -> List[Dict[str, str]]:
+        """Fetch service unit properties with a single `systemctl show` call."""
+        return self._show(["*.service"], _SERVICE_PROPERTIES) or []
+
+    def _list_units_dbus(self) -> Optional[List[Dict[str, str]]]:
+        """Fetch service unit properties over DBus.
+        
+        Returns:
+            Property dicts in the same shape as `systemctl show` output,
+            or None if DBus is unavailable
+        """
+        ok, units = self._call_dbus("ListUnits")
+        if not ok:
+            return None
+        
+        ok, unit_files = self._call_dbus("ListUnitFiles")
+        file_states = {}
+        if ok:
+            for path, state in unit_files:
+                file_states[os.path.basename(_to_str(path))] = _to_str(state)
+        
+        records = []
+        for name, description, load_state, active_state, sub_state, *_ in units:
+            name = _to_str(name)
+            if not name.endswith(".service"):
                 continue
             
-            parts = line.split(None, 4)
-            if len(parts) >= 5:
-                name = parts[0]
-                load_state = self._parse_load_state(parts[1])
-                active_state = self._parse_active_state(parts[2])
-                sub_state = parts[3]
-                description = parts[4]
-                
-                # Check if service is enabled
-                enabled = self.is_enabled(name)
-                
-                services.append(Service(
-                    name=name,
-                    load_state=load_state,
-                    active_state=active_state,
-                    sub_state=sub_state,
-                    description=description,
-                    enabled=enabled
-                ))
+            unit_file_state = file_states.get(name)
+            if unit_file_state is None and "@" in name:
+                # Template instances are not listed as unit files themselves
+                ok, state = self._call_dbus("GetUnitFileState", name.encode())
+                unit_file_state = _to_str(state) if ok else ""
+            
+            records.append({
+                "Id": name,
+                "LoadState": _to_str(load_state),
+                "ActiveState": _to_str(active_state),
+                "SubState": _to_str(sub_state),
+                "Description": _to_str(description),
+                "UnitFileState": unit_file_state or "",
+            })
         
-        return services
+        return records
+
+    def _parse_show_output(self, stdout: str) -> List[Dict[str, str]]:
+        """Parse `systemctl show` output into one property dict per unit.
+        
+        Args:
+            stdout: Output of `systemctl show`, with units separated by blank lines
+            
+        Returns:
+            List of dictionaries mapping property name to value
+        """
+        records = []
+        props = {}
+        for line in stdout.splitlines():
+            key, sep, value = line.partition('=')
+            if sep:
+                props[key] = value
+            elif props:
+                # Blank line between units
+                records.append(props)
+                props = {}
+        if props:
+            records.append(props)
+        return records
 
     def _parse_load_state(self, state: str) -> ServiceLoadState:
         """Parse load state string to enum."""
-        try:
-            return ServiceLoadState(state.lower())
-        except ValueError:
-            return ServiceLoadState.UNKNOWN
+        return _LOAD_STATE_MAP.get(state, ServiceLoadState.UNKNOWN)
 
     def _parse_active_state(self, state: str) -> ServiceState:
         """Parse active state string to enum."""
-        try:
-            return ServiceState(state.lower())
-        except ValueError:
-            return ServiceState.UNKNOWN
+        return _ACTIVE_STATE_MAP.get(state, ServiceState.UNKNOWN)
 
-    def get_service_status(self, service_name: str) -> Optional[Dict[str, str]]:
+    def get_service_status(self, service_name: str, since: Optional[str] = DEFAULT_LOG_SINCE) -> Optional[Dict[str, str]]:
         """Get detailed status of a service.
         
         Args:
             service_name: Name of the service
+            since: Only include log entries newer than this journalctl time
+                expression, or None for no limit
             
         Returns:
             Dictionary with service status information or None if failed
         """
-        returncode, stdout, stderr = self._run_command(["status", service_name])
+        records = self._show([service_name], _STATUS_PROPERTIES)
         
-        if returncode > 3:  # systemctl returns 0-3 for various states
+        if records is None:
             return None
         
+        props = records[0] if records else {}
+        
+        unit_file = props.get("FragmentPath") or "-"
+        unit_file_state = props.get("UnitFileState") or "-"
+        active_since = props.get("ActiveEnterTimestamp")
+        output_lines = [
+            f"{service_name} - {props.get('Description', '')}",
+            f"     Loaded: {props.get('LoadState', 'unknown')} ({unit_file}; {unit_file_state})",
+            f"     Active: {props.get('ActiveState', 'unknown')} ({props.get('SubState', 'unknown')})"
+            + (f" since {active_since}" if active_since else ""),
+        ]
+        if props.get("MainPID", "0") != "0":
+            output_lines.append(f"   Main PID: {props['MainPID']}")
+        
+        # A bounded, time-limited journal read instead of `systemctl status`,
+        # which tails the journal without any time filter
+        logs = self.get_service_logs(service_name, lines=10, since=since)
+        if logs:
+            output_lines.extend(["", logs.rstrip("\n")])
+        
         status_info = {
-            "output": stdout,
+            "output": "\n".join(output_lines),
             "name": service_name
         }
         
         return status_info
 
-    def get_service_logs(self, service_name: str, lines: int = 50) -> Optional[str]:
+    def get_service_logs(
+        self,
+        service_name: str,
+        lines: int = 50,
+        since: Optional[str] = DEFAULT_LOG_SINCE
+    ) -> Optional[str]:
         """Get logs for a service using journalctl.
         
         Args:
             service_name: Name of the service
             lines: Number of lines to retrieve
+            since: Only include entries newer than this journalctl time
+                expression, or None for no limit
             
         Returns:
             Log output as string or None if failed
@@ -163,16 +412,28 @@ class ServiceManager:
         if self.use_sudo:
             cmd.append("sudo")
         cmd.extend(["journalctl", "-u", service_name, "-n", str(lines), "--no-pager"])
+        if since:
+            # Lets journald use its time index instead of scanning the whole journal
+            cmd.extend(["--since", since])
         
         try:
-            result = subprocess.run(
+            with subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
-                timeout=30
-            )
-            if result.returncode == 0:
-                return result.stdout
+                bufsize=1
+            ) as process:
+                timer = threading.Timer(30, process.kill)
+                timer.start()
+                try:
+                    # Stream the output, keeping at most `lines` lines in memory
+                    tail = deque(process.stdout, maxlen=lines)
+                    returncode = process.wait()
+                finally:
+                    timer.cancel()
+            if returncode == 0:
+                return "".join(tail)
             return None
         except Exception:
             return None
@@ -186,10 +447,12 @@ class ServiceManager:
         Returns:
             Tuple of (success, message)
         """
-        returncode, stdout, stderr = self._run_command(["start", service_name])
+        # Not sent over DBus: StartUnit returns as soon as the job is queued,
+        # while systemctl waits for it to finish and reports a failed start
+        returncode, stdout, stderr = self._run_command(["start", service_name], capture_stderr_only=True)
         
         if returncode == 0:
-            return True, f"Service {service_name} started successfully"
+            return True, SUCCESS_MESSAGES["start"].format(service_name)
         else:
             return False, stderr or "Failed to start service"
 
@@ -202,10 +465,11 @@ class ServiceManager:
         Returns:
             Tuple of (success, message)
         """
-        returncode, stdout, stderr = self._run_command(["stop", service_name])
+        # Via systemctl so the result reflects the finished job; see start_service
+        returncode, stdout, stderr = self._run_command(["stop", service_name], capture_stderr_only=True)
         
         if returncode == 0:
-            return True, f"Service {service_name} stopped successfully"
+            return True, SUCCESS_MESSAGES["stop"].format(service_name)
         else:
             return False, stderr or "Failed to stop service"
 
@@ -218,10 +482,11 @@ class ServiceManager:
         Returns:
             Tuple of (success, message)
         """
-        returncode, stdout, stderr = self._run_command(["restart", service_name])
+        # Via systemctl so the result reflects the finished job; see start_service
+        returncode, stdout, stderr = self._run_command(["restart", service_name], capture_stderr_only=True)
         
         if returncode == 0:
-            return True, f"Service {service_name} restarted successfully"
+            return True, SUCCESS_MESSAGES["restart"].format(service_name)
         else:
             return False, stderr or "Failed to restart service"
 
@@ -234,10 +499,16 @@ class ServiceManager:
         Returns:
             Tuple of (success, message)
         """
-        returncode, stdout, stderr = self._run_command(["enable", service_name])
+        # Like `systemctl enable`, never force over existing symlinks and
+        # reload the daemon after changing unit files
+        if (self._call_dbus("EnableUnitFiles", [service_name.encode()], False, False)[0]
+                and self._call_dbus("Reload")[0]):
+            return True, SUCCESS_MESSAGES["enable"].format(service_name)
+        
+        returncode, stdout, stderr = self._run_command(["enable", service_name], capture_stderr_only=True)
         
         if returncode == 0:
-            return True, f"Service {service_name} enabled successfully"
+            return True, SUCCESS_MESSAGES["enable"].format(service_name)
         else:
             return False, stderr or "Failed to enable service"
 
@@ -250,10 +521,14 @@ class ServiceManager:
         Returns:
             Tuple of (success, message)
         """
-        returncode, stdout, stderr = self._run_command(["disable", service_name])
+        if (self._call_dbus("DisableUnitFiles", [service_name.encode()], False)[0]
+                and self._call_dbus("Reload")[0]):
+            return True, SUCCESS_MESSAGES["disable"].format(service_name)
+        
+        returncode, stdout, stderr = self._run_command(["disable", service_name], capture_stderr_only=True)
         
         if returncode == 0:
-            return True, f"Service {service_name} disabled successfully"
+            return True, SUCCESS_MESSAGES["disable"].format(service_name)
         else:
             return False, stderr or "Failed to disable service"
 
@@ -266,9 +541,15 @@ class ServiceManager:
         Returns:
             True if enabled, False otherwise
         """
-        returncode, stdout, stderr = self._run_command(["is-enabled", service_name])
+        ok, state = self._call_dbus("GetUnitFileState", service_name.encode())
+        if ok:
+            return _to_str(state) in _ENABLED_UNIT_FILE_STATES
         
-        return returncode == 0 and stdout.strip() == "enabled"
+        records = self._show([service_name], ["UnitFileState"])
+        if not records:
+            return False
+        
+        return records[0].get("UnitFileState", "") in _ENABLED_UNIT_FILE_STATES
 
     def reload_daemon(self) -> Tuple[bool, str]:
         """Reload systemd daemon configuration.
@@ -276,9 +557,12 @@ class ServiceManager:
         Returns:
             Tuple of (success, message)
         """
-        returncode, stdout, stderr = self._run_command(["daemon-reload"])
+        if self._call_dbus("Reload")[0]:
+            return True, SUCCESS_MESSAGES["daemon-reload"]
+        
+        returncode, stdout, stderr = self._run_command(["daemon-reload"], capture_stderr_only=True)
         
         if returncode == 0:
-            return True, "Daemon reloaded successfully"
+            return True, SUCCESS_MESSAGES["daemon-reload"]
         else:
             return False, stderr or "Failed to reload daemon"
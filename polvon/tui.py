@@ -1,13 +1,44 @@
+import array
+import asyncio
+from bisect import bisect_right
+from collections import Counter
+from functools import partial
+
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, ScrollableContainer
-from textual.widgets import Header, Footer, DataTable, Static, Button, Label, Input
+from textual.widgets import Header, Footer, DataTable, Static, Button, Label, Input, Log
+from textual.widgets.data_table import CellDoesNotExist
 from textual.binding import Binding
 from textual.screen import ModalScreen
-from textual import on
+from textual import on, work
 from textual.reactive import reactive
 from rich.text import Text
 
-from .service import ServiceManager, ServiceState
+from .service import ServiceManager, ServiceState, DEFAULT_LOG_SINCE
+
+# Delay before a search keystroke is applied, so fast typing filters only once
+SEARCH_DEBOUNCE = 0.1
+
+# Seconds to wait before re-reading a service that was just acted on
+SETTLE_DELAY = 0.5
+
+# Rows added to the table between yields to the event loop
+TABLE_CHUNK_SIZE = 200
+
+# Journal time windows cycled through with `t`; None reads the whole journal
+LOG_WINDOWS = [DEFAULT_LOG_SINCE, "1 day ago", "1 week ago", None]
+
+STATE_STYLES = {
+    ServiceState.ACTIVE: "green",
+    ServiceState.INACTIVE: "yellow",
+    ServiceState.FAILED: "red",
+}
+
+# Styled state cells, shared by every row in the same state
+STATE_TEXTS = {
+    state: Text(state.value, style=STATE_STYLES.get(state, "blue"))
+    for state in ServiceState
+}
 
 
 class ConfirmDialog(ModalScreen):
@@ -145,13 +176,14 @@ class LogScreen(ModalScreen):
 
     def compose(self) -> ComposeResult:
         yield Container(
-            ScrollableContainer(
-                Static(self.log_text, id="log_content"),
-            ),
+            Log(id="log_content"),
             Button("Close", variant="primary", id="close_button"),
             id="log_container",
         )
 
+    def on_mount(self) -> None:
+        self.query_one("#log_content", Log).write_lines(self.log_text.splitlines())
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         self.dismiss()
 
@@ -213,6 +245,7 @@ class PolvonApp(App):
         Binding("d", "disable", "Disable", show=True),
         Binding("v", "status", "Status", show=True),
         Binding("l", "logs", "Logs", show=True),
+        Binding("t", "cycle_log_window", "Log Window", show=True),
         Binding("a", "toggle_all", "Toggle All", show=True),
         Binding("/", "focus_search", "Search", show=True),
         Binding("escape", "clear_search", "Clear Search", show=False),
@@ -226,8 +259,27 @@ class PolvonApp(App):
     def __init__(self, use_sudo: bool = False):
         super().__init__()
         self.service_manager = ServiceManager(use_sudo=use_sudo)
+        self._index_blob = b""
+        self._line_starts = array.array("l")
+        # Query that produced filtered_services, for narrowing as the user types
+        self._filtered_query = ""
         self.services = []
         self.filtered_services = []
+        self.log_since = DEFAULT_LOG_SINCE
+        self._loading = False
+        self._reload_pending = False
+        self._refreshing = set()
+        self._refresh_pending = set()
+        self._search_timer = None
+        # Row keys and cells currently shown in the table
+        self._current_keys = set()
+        self._table_cells = {}
+        # Cells for every loaded service, by name
+        self._rows = {}
+        self._columns = []
+        self._table = None
+        self._info = None
+        self._search = None
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -241,78 +293,232 @@ class PolvonApp(App):
 
     def on_mount(self) -> None:
         """Set up the application on mount."""
-        table = self.query_one("#service_table", DataTable)
+        # Look widgets up once instead of walking the DOM on every update
+        self._table = self.query_one("#service_table", DataTable)
+        self._info = self.query_one("#info_bar", Static)
+        self._search = self.query_one("#search_input", Input)
+        
+        table = self._table
         table.cursor_type = "row"
         table.zebra_stripes = True
         
         # Add columns
-        table.add_columns("Service", "State", "Enabled", "Description")
+        self._columns = table.add_columns("Service", "State", "Enabled", "Description")
         
         self.load_services()
 
     def load_services(self) -> None:
-        """Load services from systemd."""
-        self.services = self.service_manager.list_services(show_all=self.show_all_services)
+        """Load services from systemd without blocking the UI."""
+        if self._loading:
+            # Coalesce with the reload already in flight
+            self._reload_pending = True
+            return
+        self._loading = True
+        self._reload_worker()
+
+    @work(thread=True)
+    def _reload_worker(self) -> None:
+        """Query systemd in a background thread."""
+        services = self.service_manager.list_services(show_all=self.show_all_services)
+        self.call_from_thread(self._apply_services, services)
+
+    def _apply_services(self, services) -> None:
+        """Display a freshly loaded service list."""
+        self._loading = False
+        self.services = services
+        self._rows = {service.name: self._row_cells(service) for service in services}
         self.filter_services()
         self.update_table()
         self.update_info_bar()
+        
+        if self._reload_pending:
+            self._reload_pending = False
+            self.load_services()
+
+    def refresh_service(self, service_name: str) -> None:
+        """Re-read a single service without blocking the UI."""
+        if service_name in self._refreshing:
+            # Coalesce with the refresh already in flight
+            self._refresh_pending.add(service_name)
+            return
+        self._refreshing.add(service_name)
+        self._refresh_service_worker(service_name)
+
+    def _refresh_after_action(self, service_name: str) -> None:
+        """Show a service's new state now and again once it has settled."""
+        self.refresh_service(service_name)
+        # systemd may still report a transitional state such as "activating"
+        self.set_timer(SETTLE_DELAY, partial(self.refresh_service, service_name))
+
+    @work(thread=True)
+    def _refresh_service_worker(self, service_name: str) -> None:
+        """Query one service in a background thread."""
+        service = self.service_manager.get_service(service_name)
+        self.call_from_thread(self._apply_service, service_name, service)
+
+    def _apply_service(self, service_name: str, service) -> None:
+        """Replace one service's data, updating its table row in place."""
+        self._refreshing.discard(service_name)
+        if service_name in self._refresh_pending:
+            self._refresh_pending.discard(service_name)
+            self.refresh_service(service_name)
+        
+        if service is None:
+            return
+        
+        self.services = [service if s.name == service.name else s for s in self.services]
+        self._rows[service.name] = self._row_cells(service)
+        self.filter_services()
+        self.update_table()
+        self.update_info_bar()
+
+    @property
+    def services(self):
+        """All loaded services."""
+        return self._services
+
+    @services.setter
+    def services(self, services) -> None:
+        self._services = services
+        self._filtered_query = ""
+        self._rebuild_search_index()
+        self._count_states()
+
+    def _count_states(self) -> None:
+        """Count services per state in one pass, for the info bar."""
+        histogram = Counter(service.active_state for service in self._services)
+        
+        self._total = len(self._services)
+        self._active_count = histogram[ServiceState.ACTIVE]
+        self._failed_count = histogram[ServiceState.FAILED]
+
+    def _rebuild_search_index(self) -> None:
+        """Join all search keys into one buffer that can be scanned in C."""
+        keys = [service.search_key.encode() for service in self._services]
+        self._index_blob = b"\n".join(keys)
+        
+        self._line_starts = array.array("l")
+        offset = 0
+        for key in keys:
+            self._line_starts.append(offset)
+            offset += len(key) + 1
 
     def filter_services(self) -> None:
         """Filter services based on search query."""
+        previous = self._filtered_query
+        self._filtered_query = self.search_query
         if not self.search_query:
             self.filtered_services = self.services
-        else:
-            query = self.search_query.lower()
+            return
+        
+        if previous and self.search_query.startswith(previous):
+            # Anything matching the longer query matched the shorter one too,
+            # so only the previous results need checking
+            query = self.search_query.casefold()
             self.filtered_services = [
-                service for service in self.services
-                if query in service.name.lower() or 
-                   (service.description and query in service.description.lower())
+                service for service in self.filtered_services if query in service.search_key
             ]
+            return
+        
+        # Pasted text can hold lone surrogates, which strict UTF-8 rejects;
+        # encoded this way they simply match nothing
+        query = self.search_query.casefold().encode(errors="surrogatepass")
+        if b"\n" in query:
+            # Would match across service boundaries in the index
+            self.filtered_services = []
+            return
+        
+        blob = self._index_blob
+        starts = self._line_starts
+        matches = []
+        pos = blob.find(query)
+        while pos != -1:
+            index = bisect_right(starts, pos) - 1
+            matches.append(self._services[index])
+            if index + 1 == len(starts):
+                break
+            # Resume at the next service; one hit per service is enough
+            pos = blob.find(query, starts[index + 1])
+        self.filtered_services = matches
+
+    def _row_cells(self, service) -> tuple:
+        """Build the table cells for a service."""
+        enabled_text = "✓" if service.enabled else "✗"
+        
+        return (
+            service.name,
+            STATE_TEXTS[service.active_state],
+            enabled_text,
+            service.description[:60] + "..." if len(service.description) > 60 else service.description,
+        )
 
-    def update_table(self) -> None:
-        """Update the service table with current data."""
-        table = self.query_one("#service_table", DataTable)
-        table.clear()
+    @work(exclusive=True, group="table")
+    async def update_table(self) -> None:
+        """Update the service table with current data.
         
-        for service in self.filtered_services:
-            # Create colored state text
-            state_text = Text(service.active_state.value)
-            if service.active_state == ServiceState.ACTIVE:
-                state_text.stylize("green")
-            elif service.active_state == ServiceState.INACTIVE:
-                state_text.stylize("yellow")
-            elif service.active_state == ServiceState.FAILED:
-                state_text.stylize("red")
-            else:
-                state_text.stylize("blue")
-            
-            enabled_text = "✓" if service.enabled else "✗"
-            
-            table.add_row(
-                service.name,
-                state_text,
-                enabled_text,
-                service.description[:60] + "..." if len(service.description) > 60 else service.description,
-                key=service.name
-            )
+        Only rows that left or entered the filter are removed or added, and
+        only cells whose content changed are rewritten. New rows are added
+        in chunks so the event loop can handle input in between.
+        """
+        table = self._table
+        new_keys = {service.name for service in self.filtered_services}
+        
+        removed = self._current_keys - new_keys
+        added = [s for s in self.filtered_services if s.name not in self._current_keys]
+        if len(removed) + len(added) > len(new_keys):
+            # Cheaper to start over than to patch
+            table.clear()
+            self._current_keys = set()
+            self._table_cells = {}
+            removed = set()
+            added = self.filtered_services
+        appending = bool(self._current_keys)
+        
+        for key in removed:
+            table.remove_row(key)
+            self._current_keys.discard(key)
+            del self._table_cells[key]
+        
+        for key in self._current_keys:
+            cells = self._rows[key]
+            shown = self._table_cells[key]
+            if cells != shown:
+                for column, value, old_value in zip(self._columns, cells, shown):
+                    if value != old_value:
+                        table.update_cell(key, column, value)
+                self._table_cells[key] = cells
+        
+        for count, service in enumerate(added, 1):
+            cells = self._rows[service.name]
+            table.add_row(*cells, key=service.name)
+            self._current_keys.add(service.name)
+            self._table_cells[service.name] = cells
+            if count % TABLE_CHUNK_SIZE == 0:
+                await asyncio.sleep(0)
+        
+        if added and appending:
+            # New rows were appended at the bottom; restore name order
+            table.sort(self._columns[0])
 
     def update_info_bar(self) -> None:
         """Update the information bar."""
-        info = self.query_one("#info_bar", Static)
-        total = len(self.services)
-        active = sum(1 for s in self.services if s.active_state == ServiceState.ACTIVE)
-        failed = sum(1 for s in self.services if s.active_state == ServiceState.FAILED)
+        # Counts only change with the service list, not with the search query
+        total = self._total
+        active = self._active_count
+        failed = self._failed_count
         
         mode = "all services" if self.show_all_services else "active services"
         search_info = f" | Filtered: {len(self.filtered_services)}" if self.search_query else ""
-        info.update(f"Total: {total} | Active: {active} | Failed: {failed} | Showing: {mode}{search_info}")
+        self._info.update(f"Total: {total} | Active: {active} | Failed: {failed} | Showing: {mode}{search_info}")
 
     def get_selected_service(self) -> str:
         """Get the currently selected service name."""
-        table = self.query_one("#service_table", DataTable)
-        if 0 <= table.cursor_row < len(self.filtered_services):
-            return self.filtered_services[table.cursor_row].name
-        return None
+        table = self._table
+        try:
+            row_key, _ = table.coordinate_to_cell_key(table.cursor_coordinate)
+        except CellDoesNotExist:
+            return None
+        return row_key.value
 
     def action_refresh(self) -> None:
         """Refresh the service list."""
@@ -335,7 +541,7 @@ class PolvonApp(App):
             success, message = self.service_manager.start_service(service_name)
             if success:
                 self.notify(message, severity="information")
-                self.load_services()
+                self._refresh_after_action(service_name)
             else:
                 self.notify(f"Error: {message}", severity="error")
 
@@ -354,7 +560,7 @@ class PolvonApp(App):
             success, message = self.service_manager.stop_service(service_name)
             if success:
                 self.notify(message, severity="information")
-                self.load_services()
+                self._refresh_after_action(service_name)
             else:
                 self.notify(f"Error: {message}", severity="error")
 
@@ -373,7 +579,7 @@ class PolvonApp(App):
             success, message = self.service_manager.restart_service(service_name)
             if success:
                 self.notify(message, severity="information")
-                self.load_services()
+                self._refresh_after_action(service_name)
             else:
                 self.notify(f"Error: {message}", severity="error")
 
@@ -392,7 +598,7 @@ class PolvonApp(App):
             success, message = self.service_manager.enable_service(service_name)
             if success:
                 self.notify(message, severity="information")
-                self.load_services()
+                self._refresh_after_action(service_name)
             else:
                 self.notify(f"Error: {message}", severity="error")
 
@@ -411,7 +617,7 @@ class PolvonApp(App):
             success, message = self.service_manager.disable_service(service_name)
             if success:
                 self.notify(message, severity="information")
-                self.load_services()
+                self._refresh_after_action(service_name)
             else:
                 self.notify(f"Error: {message}", severity="error")
 
@@ -426,7 +632,7 @@ class PolvonApp(App):
             self.notify("No service selected", severity="warning")
             return
 
-        status_info = self.service_manager.get_service_status(service_name)
+        status_info = self.service_manager.get_service_status(service_name, since=self.log_since)
         if status_info:
             self.push_screen(StatusScreen(status_info["output"]))
         else:
@@ -439,28 +645,45 @@ class PolvonApp(App):
             self.notify("No service selected", severity="warning")
             return
 
-        logs = self.service_manager.get_service_logs(service_name)
-        if logs:
-            self.push_screen(LogScreen(logs))
-        else:
+        logs = self.service_manager.get_service_logs(service_name, since=self.log_since)
+        if logs is None:
             self.notify("Failed to get service logs", severity="error")
+        elif not logs:
+            # journalctl succeeded but the time window holds no entries
+            if self.log_since:
+                self.notify(f"No log entries since {self.log_since}; press t to widen", severity="warning")
+            else:
+                self.notify("No log entries for this service", severity="warning")
+        else:
+            self.push_screen(LogScreen(logs))
+
+    def action_cycle_log_window(self) -> None:
+        """Switch to the next time window for status and log views."""
+        index = (LOG_WINDOWS.index(self.log_since) + 1) % len(LOG_WINDOWS)
+        self.log_since = LOG_WINDOWS[index]
+        window = f"since {self.log_since}" if self.log_since else "entire journal"
+        self.notify(f"Log window: {window}")
 
     def action_focus_search(self) -> None:
         """Focus the search input."""
-        search_input = self.query_one("#search_input", Input)
-        search_input.focus()
+        self._search.focus()
 
     def action_clear_search(self) -> None:
         """Clear the search input."""
-        search_input = self.query_one("#search_input", Input)
-        search_input.value = ""
-        table = self.query_one("#service_table", DataTable)
-        table.focus()
+        self._search.value = ""
+        self._table.focus()
 
     @on(Input.Changed, "#search_input")
     def on_search_input_changed(self, event: Input.Changed) -> None:
         """Handle search input changes."""
         self.search_query = event.value
+        if self._search_timer is not None:
+            self._search_timer.stop()
+        self._search_timer = self.set_timer(SEARCH_DEBOUNCE, self._apply_search)
+
+    def _apply_search(self) -> None:
+        """Filter the table once typing has paused."""
+        self._search_timer = None
         self.filter_services()
         self.update_table()
         self.update_info_bar()
@@ -1,16 +1,83 @@
 """Tests for the service management module."""
 
+import subprocess
+import sys
 import unittest
+from dataclasses import FrozenInstanceError
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 from polvon.service import ServiceManager, Service, ServiceState, ServiceLoadState
 
+# Results for mocked ServiceManager._run_command calls, as
+# (returncode, stdout, stderr)
+_OK = (0, "", "")
+_FAIL = (1, "", "Failed to start test.service")
+
+# Results for mocked subprocess.run calls. The code under test only reads
+# these three attributes, so plain namespaces stand in for CompletedProcess.
+_RUN_OK = SimpleNamespace(returncode=0, stdout="", stderr="")
+_RUN_FAIL = SimpleNamespace(returncode=1, stdout=None, stderr=b"Failed to start test.service")
+_TIMEOUT = subprocess.TimeoutExpired("cmd", 30)
+
+
+def _ok(stdout):
+    """Build a successful _run_command result with the given output."""
+    return (0, stdout, "")
+
+
+class TestService(unittest.TestCase):
+    """Test cases for the Service dataclass."""
+
+    def test_search_key(self):
+        """Test the search key combines case-folded name and description."""
+        service = Service(
+            name="Test.service",
+            load_state=ServiceLoadState.LOADED,
+            active_state=ServiceState.ACTIVE,
+            sub_state="running",
+            description="Test Service"
+        )
+        
+        self.assertEqual(service.search_key, "test.service\0test service")
+
+    def test_frozen(self):
+        """Test Service instances cannot be modified after creation."""
+        service = Service(
+            name="test.service",
+            load_state=ServiceLoadState.LOADED,
+            active_state=ServiceState.ACTIVE,
+            sub_state="running",
+            description="Test Service"
+        )
+        
+        with self.assertRaises(FrozenInstanceError):
+            service.enabled = True
+
+    @unittest.skipIf(sys.version_info < (3, 10), "dataclass slots require Python 3.10")
+    def test_uses_slots(self):
+        """Test Service instances do not carry a __dict__."""
+        service = Service(
+            name="test.service",
+            load_state=ServiceLoadState.LOADED,
+            active_state=ServiceState.ACTIVE,
+            sub_state="running",
+            description="Test Service"
+        )
+        
+        self.assertFalse(hasattr(service, "__dict__"))
+
 
 class TestServiceManager(unittest.TestCase):
     """Test cases for ServiceManager class."""
 
     def setUp(self):
         """Set up test fixtures."""
-        self.manager = ServiceManager(use_sudo=False)
+        self.manager = ServiceManager(use_sudo=False, use_dbus=False)
+        
+        # Stub out systemctl itself; TestRunCommand covers _run_command
+        self._patcher = patch.object(self.manager, '_run_command', return_value=_OK)
+        self.mock_run = self._patcher.start()
+        self.addCleanup(self._patcher.stop)
 
     def test_init(self):
         """Test ServiceManager initialization."""
@@ -19,179 +86,322 @@ class TestServiceManager(unittest.TestCase):
         
         manager_with_sudo = ServiceManager(use_sudo=True)
         self.assertTrue(manager_with_sudo.use_sudo)
+        
+        manager_without_dbus = ServiceManager(use_dbus=False)
+        self.assertFalse(manager_without_dbus.use_dbus)
 
-    @patch('subprocess.run')
-    def test_list_services_success(self, mock_run):
-        """Test listing services successfully."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "test.service loaded active running Test Service\n"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
-        
-        # Mock is_enabled
-        with patch.object(self.manager, 'is_enabled', return_value=True):
+    def test_list_services_dbus(self):
+        """Test listing services over DBus."""
+        dbus = MagicMock()
+        dbus.Manager.ListUnits.return_value = [
+            (b"test.service", b"Test Service", b"loaded", b"active", b"running",
+             b"", b"/org/freedesktop/systemd1/unit/test_2eservice", 0, b"", b"/"),
+            (b"test.socket", b"Test Socket", b"loaded", b"active", b"listening",
+             b"", b"/org/freedesktop/systemd1/unit/test_2esocket", 0, b"", b"/"),
+        ]
+        dbus.Manager.ListUnitFiles.return_value = [
+            (b"/etc/systemd/system/test.service", b"enabled"),
+        ]
+        self.manager.use_dbus = True
+        
+        with patch.object(self.manager, '_get_dbus_manager', return_value=dbus):
             services = self.manager.list_services()
         
+        self.mock_run.assert_not_called()
         self.assertEqual(len(services), 1)
         self.assertEqual(services[0].name, "test.service")
         self.assertEqual(services[0].active_state, ServiceState.ACTIVE)
+        self.assertTrue(services[0].enabled)
 
-    @patch('subprocess.run')
-    def test_start_service_success(self, mock_run):
-        """Test starting a service successfully."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = ""
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+    def test_start_service_waits_for_job(self):
+        """Test starting goes through systemctl, which waits for the job, even with DBus."""
+        dbus = MagicMock()
+        self.mock_run.return_value = _FAIL
+        self.manager.use_dbus = True
         
-        success, message = self.manager.start_service("test.service")
+        with patch.object(self.manager, '_get_dbus_manager', return_value=dbus):
+            success, message = self.manager.start_service("test.service")
         
-        self.assertTrue(success)
-        self.assertIn("started successfully", message)
+        dbus.Manager.StartUnit.assert_not_called()
+        self.mock_run.assert_called_once_with(["start", "test.service"], capture_stderr_only=True)
+        self.assertFalse(success)
 
-    @patch('subprocess.run')
-    def test_start_service_failure(self, mock_run):
-        """Test starting a service with failure."""
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stdout = ""
-        mock_result.stderr = "Failed to start test.service"
-        mock_run.return_value = mock_result
+    def test_enable_service_dbus_falls_back(self):
+        """Test unit file changes fall back to systemctl when the DBus call fails."""
+        dbus = MagicMock()
+        dbus.Manager.EnableUnitFiles.side_effect = Exception("Access denied")
+        self.mock_run.return_value = _OK
+        self.manager.use_dbus = True
         
-        success, message = self.manager.start_service("test.service")
+        with patch.object(self.manager, '_get_dbus_manager', return_value=dbus):
+            success, message = self.manager.enable_service("test.service")
         
-        self.assertFalse(success)
-        self.assertIn("Failed", message)
+        dbus.Manager.EnableUnitFiles.assert_called_once_with([b"test.service"], False, False)
+        self.mock_run.assert_called_once_with(["enable", "test.service"], capture_stderr_only=True)
+        self.assertTrue(success)
 
-    @patch('subprocess.run')
-    def test_stop_service_success(self, mock_run):
-        """Test stopping a service successfully."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = ""
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+    def test_list_services_success(self):
+        """Test listing services successfully."""
+        mock_result = _ok(
+            "Id=test.service\n"
+            "LoadState=loaded\n"
+            "ActiveState=active\n"
+            "SubState=running\n"
+            "Description=Test Service\n"
+            "UnitFileState=enabled\n"
+        )
+        self.mock_run.return_value = mock_result
         
-        success, message = self.manager.stop_service("test.service")
+        services = self.manager.list_services()
         
-        self.assertTrue(success)
-        self.assertIn("stopped successfully", message)
+        self.mock_run.assert_called_once()
+        self.assertEqual(len(services), 1)
+        self.assertEqual(services[0].name, "test.service")
+        self.assertEqual(services[0].load_state, ServiceLoadState.LOADED)
+        self.assertEqual(services[0].active_state, ServiceState.ACTIVE)
+        self.assertEqual(services[0].sub_state, "running")
+        self.assertEqual(services[0].description, "Test Service")
+        self.assertTrue(services[0].enabled)
 
-    @patch('subprocess.run')
-    def test_restart_service_success(self, mock_run):
-        """Test restarting a service successfully."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = ""
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+    def test_list_services_multiple_units(self):
+        """Test listing several services from one systemctl show call."""
+        mock_result = _ok(
+            "Id=b.service\nLoadState=loaded\nActiveState=inactive\n"
+            "SubState=dead\nDescription=B Service\nUnitFileState=disabled\n"
+            "\n"
+            "Id=a.service\nLoadState=loaded\nActiveState=active\n"
+            "SubState=running\nDescription=A=Service\nUnitFileState=alias\n"
+            "\n"
+            "Id=c.service\nLoadState=loaded\nActiveState=failed\n"
+            "SubState=failed\nDescription=C Service\nUnitFileState=static\n"
+        )
+        self.mock_run.return_value = mock_result
         
-        success, message = self.manager.restart_service("test.service")
+        services = self.manager.list_services(show_all=True)
         
-        self.assertTrue(success)
-        self.assertIn("restarted successfully", message)
+        self.assertEqual([s.name for s in services], ["a.service", "b.service", "c.service"])
+        self.assertEqual(services[0].description, "A=Service")
+        self.assertEqual([s.enabled for s in services], [True, False, False])
+        
+        # Inactive units are hidden unless all services are requested
+        services = self.manager.list_services()
+        
+        self.assertEqual([s.name for s in services], ["a.service", "c.service"])
 
-    @patch('subprocess.run')
-    def test_enable_service_success(self, mock_run):
-        """Test enabling a service successfully."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = ""
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+    def test_get_service(self):
+        """Test reading the state of a single service."""
+        mock_result = _ok(
+            "Id=test.service\nLoadState=loaded\nActiveState=inactive\n"
+            "SubState=dead\nDescription=Test Service\nUnitFileState=disabled\n"
+        )
+        self.mock_run.return_value = mock_result
         
-        success, message = self.manager.enable_service("test.service")
+        service = self.manager.get_service("test.service")
         
-        self.assertTrue(success)
-        self.assertIn("enabled successfully", message)
+        self.assertEqual(self.mock_run.call_args[0][0][-1], "test.service")
+        self.assertEqual(service.name, "test.service")
+        self.assertEqual(service.active_state, ServiceState.INACTIVE)
+        self.assertFalse(service.enabled)
 
-    @patch('subprocess.run')
-    def test_disable_service_success(self, mock_run):
-        """Test disabling a service successfully."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = ""
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+    def test_action_success(self):
+        """Test each service action reports success."""
+        actions = [
+            ("start_service", "Service test.service started successfully"),
+            ("stop_service", "Service test.service stopped successfully"),
+            ("restart_service", "Service test.service restarted successfully"),
+            ("enable_service", "Service test.service enabled successfully"),
+            ("disable_service", "Service test.service disabled successfully"),
+        ]
+        self.mock_run.return_value = _OK
         
-        success, message = self.manager.disable_service("test.service")
+        for method, expected in actions:
+            with self.subTest(method=method):
+                success, message = getattr(self.manager, method)("test.service")
+                
+                self.assertTrue(success)
+                self.assertEqual(message, expected)
+
+    def test_start_service_failure(self):
+        """Test starting a service with failure."""
+        self.mock_run.return_value = _FAIL
         
-        self.assertTrue(success)
-        self.assertIn("disabled successfully", message)
+        success, message = self.manager.start_service("test.service")
+        
+        self.assertFalse(success)
+        self.assertEqual(message, "Failed to start test.service")
+        self.mock_run.assert_called_once_with(["start", "test.service"], capture_stderr_only=True)
 
-    @patch('subprocess.run')
-    def test_is_enabled_true(self, mock_run):
+    def test_is_enabled_true(self):
         """Test checking if service is enabled."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "enabled\n"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        mock_result = _ok("Id=test.service\nUnitFileState=enabled\n")
+        self.mock_run.return_value = mock_result
         
         result = self.manager.is_enabled("test.service")
         
+        self.mock_run.assert_called_once_with(
+            ["show", "--property=Id,UnitFileState", "--", "test.service"]
+        )
         self.assertTrue(result)
 
-    @patch('subprocess.run')
-    def test_is_enabled_false(self, mock_run):
+    def test_is_enabled_false(self):
         """Test checking if service is not enabled."""
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stdout = "disabled\n"
-        mock_result.stderr = ""
-        mock_run.return_value = mock_result
+        mock_result = _ok("Id=test.service\nUnitFileState=disabled\n")
+        self.mock_run.return_value = mock_result
         
         result = self.manager.is_enabled("test.service")
         
         self.assertFalse(result)
 
-    @patch('subprocess.run')
-    def test_command_timeout(self, mock_run):
-        """Test command timeout handling."""
-        import subprocess
-        mock_run.side_effect = subprocess.TimeoutExpired("cmd", 30)
+    def test_is_enabled_failure(self):
+        """Test a failed lookup reports the service as not enabled."""
+        self.mock_run.return_value = _FAIL
         
-        returncode, stdout, stderr = self.manager._run_command(["status", "test.service"])
+        self.assertFalse(self.manager.is_enabled("test.service"))
+
+    def test_is_enabled_dbus(self):
+        """Test enabled state is read over DBus when available."""
+        dbus = MagicMock()
+        dbus.Manager.GetUnitFileState.return_value = b"enabled"
+        self.manager.use_dbus = True
         
-        self.assertEqual(returncode, 1)
-        self.assertEqual(stdout, "")
-        self.assertIn("timed out", stderr)
+        with patch.object(self.manager, '_get_dbus_manager', return_value=dbus):
+            result = self.manager.is_enabled("test.service")
+        
+        dbus.Manager.GetUnitFileState.assert_called_once_with(b"test.service")
+        self.mock_run.assert_not_called()
+        self.assertTrue(result)
 
-    def test_parse_load_state(self):
-        """Test parsing load state."""
-        self.assertEqual(
-            self.manager._parse_load_state("loaded"),
-            ServiceLoadState.LOADED
-        )
-        self.assertEqual(
-            self.manager._parse_load_state("not-found"),
-            ServiceLoadState.NOT_FOUND
-        )
-        self.assertEqual(
-            self.manager._parse_load_state("invalid"),
-            ServiceLoadState.UNKNOWN
-        )
+    @patch('subprocess.Popen')
+    def test_get_service_logs_keeps_last_lines(self, mock_popen):
+        """Test only the requested number of log lines is kept."""
+        process = mock_popen.return_value.__enter__.return_value
+        process.stdout = iter(["-- Journal begins --\n", "first\n", "second\n"])
+        process.wait.return_value = 0
+        
+        logs = self.manager.get_service_logs("test.service", lines=2)
+        
+        self.assertEqual(logs, "first\nsecond\n")
 
-    def test_parse_active_state(self):
-        """Test parsing active state."""
-        self.assertEqual(
-            self.manager._parse_active_state("active"),
-            ServiceState.ACTIVE
-        )
-        self.assertEqual(
-            self.manager._parse_active_state("inactive"),
-            ServiceState.INACTIVE
+    @patch('subprocess.Popen')
+    def test_get_service_logs_failure(self, mock_popen):
+        """Test log retrieval failure returns None."""
+        process = mock_popen.return_value.__enter__.return_value
+        process.stdout = iter([])
+        process.wait.return_value = 1
+        
+        self.assertIsNone(self.manager.get_service_logs("test.service"))
+
+    @patch('subprocess.Popen')
+    def test_get_service_logs_since(self, mock_popen):
+        """Test journal queries are limited to a time window."""
+        process = mock_popen.return_value.__enter__.return_value
+        process.stdout = iter([])
+        process.wait.return_value = 0
+        
+        self.manager.get_service_logs("test.service", since="1 day ago")
+        cmd = mock_popen.call_args[0][0]
+        self.assertEqual(cmd[cmd.index("--since") + 1], "1 day ago")
+        
+        self.manager.get_service_logs("test.service", since=None)
+        self.assertNotIn("--since", mock_popen.call_args[0][0])
+
+    @patch('subprocess.Popen')
+    def test_get_service_status(self, mock_popen):
+        """Test service status combines unit properties and recent logs."""
+        mock_result = _ok(
+            "Description=Test Service\n"
+            "LoadState=loaded\n"
+            "FragmentPath=/etc/systemd/system/test.service\n"
+            "UnitFileState=enabled\n"
+            "ActiveState=active\n"
+            "SubState=running\n"
+            "ActiveEnterTimestamp=Mon 2024-01-01 00:00:00 UTC\n"
+            "MainPID=42\n"
         )
-        self.assertEqual(
-            self.manager._parse_active_state("failed"),
-            ServiceState.FAILED
+        self.mock_run.return_value = mock_result
+        process = mock_popen.return_value.__enter__.return_value
+        process.stdout = iter(["Started Test Service.\n"])
+        process.wait.return_value = 0
+        
+        status = self.manager.get_service_status("test.service")
+        
+        self.assertEqual(self.mock_run.call_args[0][0][0], "show")
+        self.assertIn("-n", mock_popen.call_args[0][0])
+        self.assertIn("Active: active (running) since Mon 2024-01-01", status["output"])
+        self.assertIn("Main PID: 42", status["output"])
+        self.assertIn("Started Test Service.", status["output"])
+
+    def test_parse_states(self):
+        """Test parsing load and active states."""
+        cases = [
+            (self.manager._parse_load_state, "loaded", ServiceLoadState.LOADED),
+            (self.manager._parse_load_state, "not-found", ServiceLoadState.NOT_FOUND),
+            (self.manager._parse_load_state, "invalid", ServiceLoadState.UNKNOWN),
+            (self.manager._parse_active_state, "active", ServiceState.ACTIVE),
+            (self.manager._parse_active_state, "inactive", ServiceState.INACTIVE),
+            (self.manager._parse_active_state, "failed", ServiceState.FAILED),
+            (self.manager._parse_active_state, "invalid", ServiceState.UNKNOWN),
+        ]
+        
+        for parse, value, expected in cases:
+            with self.subTest(parse=parse.__name__, value=value):
+                self.assertEqual(parse(value), expected)
+
+
+class TestRunCommand(unittest.TestCase):
+    """Test cases for running systemctl through subprocess."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.manager = ServiceManager(use_sudo=False, use_dbus=False)
+        
+        self._patcher = patch('subprocess.run')
+        self.mock_run = self._patcher.start()
+        self.addCleanup(self._patcher.stop)
+
+    def test_command_output(self):
+        """Test command output is captured as text."""
+        self.mock_run.return_value = SimpleNamespace(returncode=0, stdout="Id=test.service\n", stderr="")
+        
+        result = self.manager._run_command(["show", "test.service"])
+        
+        self.assertEqual(result, (0, "Id=test.service\n", ""))
+        self.mock_run.assert_called_once_with(
+            ["systemctl", "show", "test.service"],
+            capture_output=True,
+            text=True,
+            timeout=30
         )
-        self.assertEqual(
-            self.manager._parse_active_state("invalid"),
-            ServiceState.UNKNOWN
+
+    def test_command_sudo(self):
+        """Test commands are prefixed with sudo when requested."""
+        self.manager.use_sudo = True
+        self.mock_run.return_value = _RUN_OK
+        
+        self.manager._run_command(["start", "test.service"])
+        
+        self.assertEqual(self.mock_run.call_args[0][0], ["sudo", "systemctl", "start", "test.service"])
+
+    def test_command_stderr_only(self):
+        """Test stdout is discarded and stderr decoded only on failure."""
+        self.mock_run.return_value = _RUN_FAIL
+        
+        returncode, stdout, stderr = self.manager._run_command(
+            ["start", "test.service"], capture_stderr_only=True
         )
+        
+        self.assertEqual((returncode, stdout, stderr), (1, "", "Failed to start test.service"))
+        self.assertEqual(self.mock_run.call_args[1]["stdout"], subprocess.DEVNULL)
+
+    def test_command_timeout(self):
+        """Test command timeout handling."""
+        self.mock_run.side_effect = _TIMEOUT
+        
+        returncode, stdout, stderr = self.manager._run_command(["status", "test.service"])
+        
+        self.assertEqual(returncode, 1)
+        self.assertEqual(stdout, "")
+        self.assertIn("timed out", stderr)
 
 
 if __name__ == '__main__':
@@ -9,12 +9,15 @@ from polvon.service import Service, ServiceState, ServiceLoadState
 class TestTUISearch(unittest.TestCase):
     """Test cases for TUI search functionality."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.app = PolvonApp(use_sudo=False)
+    @classmethod
+    def setUpClass(cls):
+        """Set up fixtures shared by all tests."""
+        # Every test assigns services and search_query before filtering,
+        # so one app instance can serve the whole class
+        cls.app = PolvonApp(use_sudo=False)
         
-        # Create test services
-        self.test_services = [
+        # Filtering never mutates the services, so tests share this tuple
+        cls.TEST_SERVICES = (
             Service(
                 name="nginx.service",
                 load_state=ServiceLoadState.LOADED,
@@ -47,20 +50,21 @@ class TestTUISearch(unittest.TestCase):
                 description="MySQL Database Server",
                 enabled=True
             ),
-        ]
+        )
 
     def test_filter_services_empty_query(self):
         """Test filtering services with empty query returns all services."""
-        self.app.services = self.test_services
+        self.app.services = self.TEST_SERVICES
         self.app.search_query = ""
         self.app.filter_services()
         
         self.assertEqual(len(self.app.filtered_services), 4)
-        self.assertEqual(self.app.filtered_services, self.test_services)
+        # An empty query hands back the loaded services without scanning them
+        self.assertIs(self.app.filtered_services, self.TEST_SERVICES)
 
     def test_filter_services_by_name(self):
         """Test filtering services by name."""
-        self.app.services = self.test_services
+        self.app.services = self.TEST_SERVICES
         self.app.search_query = "nginx"
         self.app.filter_services()
         
@@ -69,7 +73,7 @@ class TestTUISearch(unittest.TestCase):
 
     def test_filter_services_by_description(self):
         """Test filtering services by description."""
-        self.app.services = self.test_services
+        self.app.services = self.TEST_SERVICES
         self.app.search_query = "server"
         self.app.filter_services()
         
@@ -78,7 +82,7 @@ class TestTUISearch(unittest.TestCase):
 
     def test_filter_services_case_insensitive(self):
         """Test filtering is case insensitive."""
-        self.app.services = self.test_services
+        self.app.services = self.TEST_SERVICES
         self.app.search_query = "NGINX"
         self.app.filter_services()
         
@@ -87,7 +91,7 @@ class TestTUISearch(unittest.TestCase):
 
     def test_filter_services_partial_match(self):
         """Test filtering with partial match."""
-        self.app.services = self.test_services
+        self.app.services = self.TEST_SERVICES
         self.app.search_query = "apach"
         self.app.filter_services()
         
@@ -96,7 +100,7 @@ class TestTUISearch(unittest.TestCase):
 
     def test_filter_services_no_match(self):
         """Test filtering with no matching services."""
-        self.app.services = self.test_services
+        self.app.services = self.TEST_SERVICES
         self.app.search_query = "nonexistent"
         self.app.filter_services()
         
@@ -104,7 +108,7 @@ class TestTUISearch(unittest.TestCase):
 
     def test_filter_services_multiple_matches(self):
         """Test filtering with multiple matches."""
-        self.app.services = self.test_services
+        self.app.services = self.TEST_SERVICES
         self.app.search_query = "http"
         self.app.filter_services()
         
@@ -112,6 +116,80 @@ class TestTUISearch(unittest.TestCase):
         self.assertEqual(len(self.app.filtered_services), 1)
         self.assertEqual(self.app.filtered_services[0].name, "apache2.service")
 
+    def test_filter_services_one_result_per_service(self):
+        """Test services matching in both name and description appear once."""
+        self.app.services = self.TEST_SERVICES
+        self.app.search_query = "s"
+        self.app.filter_services()
+        
+        self.assertEqual(self.app.filtered_services, list(self.TEST_SERVICES))
+
+    def test_filter_services_narrows_extended_query(self):
+        """Test typing more characters narrows the previous results."""
+        self.app.services = self.TEST_SERVICES
+        self.app.search_query = "se"
+        self.app.filter_services()
+        self.assertEqual(len(self.app.filtered_services), 4)
+        
+        self.app.search_query = "ser"
+        with patch.object(self.app, "_index_blob", b""):
+            # Narrowing only rechecks the previous matches, not the index
+            self.app.filter_services()
+        
+        self.assertEqual(len(self.app.filtered_services), 4)
+        
+        self.app.search_query = "server d"
+        self.app.filter_services()
+        
+        self.assertEqual([s.name for s in self.app.filtered_services], ["ssh.service"])
+        
+        # A query that does not extend the last one searches the whole index
+        self.app.search_query = "sql"
+        self.app.filter_services()
+        
+        self.assertEqual([s.name for s in self.app.filtered_services], ["mysql.service"])
+
+    def test_filter_services_last_service(self):
+        """Test a match in the last service is found."""
+        self.app.services = self.TEST_SERVICES
+        self.app.search_query = "database"
+        self.app.filter_services()
+        
+        self.assertEqual(len(self.app.filtered_services), 1)
+        self.assertEqual(self.app.filtered_services[0].name, "mysql.service")
+
+    def test_state_counts(self):
+        """Test state counts are computed when services are assigned."""
+        self.app.services = self.TEST_SERVICES
+        
+        self.assertEqual(self.app._total, 4)
+        self.assertEqual(self.app._active_count, 2)
+        self.assertEqual(self.app._failed_count, 1)
+
+    def test_filter_services_casefold(self):
+        """Test filtering folds case beyond ASCII lowercasing."""
+        service = Service(
+            name="strasse.service",
+            load_state=ServiceLoadState.LOADED,
+            active_state=ServiceState.ACTIVE,
+            sub_state="running",
+            description="Straße Sync",
+            enabled=True
+        )
+        self.app.services = [service]
+        self.app.search_query = "STRASSE SYNC"
+        self.app.filter_services()
+        
+        self.assertEqual(self.app.filtered_services, [service])
+
+    def test_filter_services_unencodable_query(self):
+        """Test a query with a lone surrogate matches nothing."""
+        self.app.services = self.TEST_SERVICES
+        self.app.search_query = "nginx\udcff"
+        self.app.filter_services()
+        
+        self.assertEqual(self.app.filtered_services, [])
+
     def test_filter_services_with_none_description(self):
         """Test filtering services when description is None."""
         service_with_none = Service(